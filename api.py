@@ -1,11 +1,16 @@
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, HttpUrl
 from typing import Optional, Dict, List, Any
 import uvicorn
-from complete_data_extractor import extract_all_webpage_data
+import asyncio
+from complete_data_extractor import IMAGE_MARKDOWN_RE, extract_all_webpage_data
 from depth_scraper import scrape_with_depth
-import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from urllib.parse import urlparse
 
 # Initialize FastAPI app
@@ -40,6 +45,11 @@ class DepthExtractionRequest(BaseModel):
     max_pages: int = 10
     delay: float = 1.0
 
+class BatchExtractionRequest(BaseModel):
+    urls: List[HttpUrl]
+    include_images: bool = False
+    include_videos: bool = False
+
 class ExtractionResponse(BaseModel):
     success: bool
     url: str
@@ -52,19 +62,54 @@ class ErrorResponse(BaseModel):
     error: str
     details: Optional[str] = None
 
+# Batch requests: at most this many URLs, with this many fetched at once
+MAX_BATCH_URLS = 20
+BATCH_CONCURRENCY = 8
+
+# Recent extraction results, so a repeated request for the same page within
+# the TTL skips the fetch and parse entirely
+_EXTRACT_CACHE = OrderedDict()
+_EXTRACT_CACHE_SIZE = 128
+_EXTRACT_CACHE_TTL = 300
+_EXTRACT_CACHE_LOCK = threading.Lock()
+
 # Helper functions
+def cached_extract(url: str, include_images: bool, include_videos: bool) -> str:
+    """Extract a webpage, reusing a result from the last few minutes"""
+    key = (url, include_images, include_videos)
+    with _EXTRACT_CACHE_LOCK:
+        entry = _EXTRACT_CACHE.get(key)
+        if entry is not None:
+            if time.monotonic() - entry[0] < _EXTRACT_CACHE_TTL:
+                _EXTRACT_CACHE.move_to_end(key)
+                return entry[1]
+            del _EXTRACT_CACHE[key]
+    
+    content = extract_all_webpage_data(url, include_images=include_images, include_videos=include_videos)
+    
+    with _EXTRACT_CACHE_LOCK:
+        _EXTRACT_CACHE[key] = (time.monotonic(), content)
+        _EXTRACT_CACHE.move_to_end(key)
+        while len(_EXTRACT_CACHE) > _EXTRACT_CACHE_SIZE:
+            _EXTRACT_CACHE.popitem(last=False)
+    return content
+
+@lru_cache(maxsize=256)
 def is_valid_url(url: str) -> bool:
     """Validate URL format"""
+    # Cheap scheme check first; only http(s) pages can be extracted anyway
+    if not url[:8].lower().startswith(('http://', 'https://')):
+        return False
     try:
-        result = urlparse(str(url))
-        return all([result.scheme, result.netloc])
-    except:
+        result = urlparse(url)
+        return bool(result.scheme) and bool(result.netloc)
+    except Exception:
         return False
 
 def separate_content_types(content: str) -> Dict[str, List[str]]:
     """Separate content into text, images, and videos"""
     # Extract all images from the entire content first
-    all_images = re.findall(r'!\[.*?\]\([^)]+\)', content)
+    all_images = IMAGE_MARKDOWN_RE.findall(content)
     
     # Remove images from content and split into sections
     text_only_content = content
@@ -133,11 +178,13 @@ async def extract_content(request: ExtractionRequest):
         if not is_valid_url(str(request.url)):
             raise HTTPException(status_code=400, detail="Invalid URL format")
         
-        # Extract content
-        raw_content = extract_all_webpage_data(
+        # Extract content in a worker thread; the fetch and parse are blocking
+        # and would otherwise stall every other request on the event loop
+        raw_content = await run_in_threadpool(
+            cached_extract,
             str(request.url), 
-            include_images=request.include_images, 
-            include_videos=request.include_videos
+            request.include_images, 
+            request.include_videos
         )
         
         # Check if extraction was successful
@@ -212,6 +259,51 @@ async def extract_full_content(url: HttpUrl):
     request = ExtractionRequest(url=url, include_images=True, include_videos=True)
     return await extract_content(request)
 
+@app.post("/extract/batch", response_model=Dict[str, Any])
+async def extract_batch(request: BatchExtractionRequest):
+    """
+    Extract content from several webpages concurrently
+    
+    - **urls**: The webpage URLs to extract content from (up to 20)
+    - **include_images**: Whether to include images in extraction (default: false)
+    - **include_videos**: Whether to include videos in extraction (default: false)
+    """
+    # Drop repeated URLs while keeping the order they were given in
+    urls = list(dict.fromkeys(str(url) for url in request.urls))
+    if not urls:
+        raise HTTPException(status_code=400, detail="At least one URL is required")
+    if len(urls) > MAX_BATCH_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_URLS} URLs can be extracted per batch")
+    
+    # Each extraction runs in a worker thread; the semaphore bounds how many
+    # pages are fetched at once so their network waits overlap
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def extract_one(url):
+        async with semaphore:
+            try:
+                return await extract_content(ExtractionRequest(
+                    url=url,
+                    include_images=request.include_images,
+                    include_videos=request.include_videos
+                ))
+            except HTTPException as e:
+                return ErrorResponse(error=e.detail, details=url)
+    
+    results = await asyncio.gather(*(extract_one(url) for url in urls))
+    succeeded = sum(1 for result in results if result.success)
+    
+    return {
+        "success": succeeded > 0,
+        "results": results,
+        "stats": {
+            "requested": len(urls),
+            "succeeded": succeeded,
+            "failed": len(urls) - succeeded
+        },
+        "message": f"Extracted {succeeded} of {len(urls)} URLs"
+    }
+
 @app.post("/extract/depth", response_model=Dict[str, Any])
 async def extract_with_depth(request: DepthExtractionRequest):
     """
@@ -238,8 +330,10 @@ async def extract_with_depth(request: DepthExtractionRequest):
         if not (0.5 <= request.delay <= 3.0):
             raise HTTPException(status_code=400, detail="Delay must be between 0.5 and 3.0 seconds")
         
-        # Extract content with depth
-        formatted_content = scrape_with_depth(
+        # Extract content with depth; the crawl sleeps between pages, so it runs
+        # in a worker thread rather than on the event loop
+        formatted_content = await run_in_threadpool(
+            scrape_with_depth,
             str(request.url),
             depth=request.depth,
             include_images=request.include_images,
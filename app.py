@@ -1,8 +1,11 @@
 import streamlit as st
 import requests
 import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from urllib.parse import urlparse
-from complete_data_extractor import extract_all_webpage_data
+from complete_data_extractor import IMAGE_MARKDOWN_RE, MULTI_NEWLINE_RE, extract_all_webpage_data, new_session
 from depth_scraper import scrape_with_depth
 
 # Configure the Streamlit page
@@ -12,34 +15,119 @@ st.set_page_config(
     layout="wide"
 )
 
+# Upper bound on simultaneous extractions when several URLs are submitted
+MAX_CONCURRENT_EXTRACTIONS = 8
+
+# http(s) scheme followed by a non-empty host, no whitespace anywhere
+_URL_RE = re.compile(r'^https?://[^\s/$.?#][^\s]*$', re.I)
+
+# Plain-text export drops heading markers and turns bullets into dashes
+_PLAIN_TEXT_TABLE = str.maketrans({'#': None, '•': '-'})
+
+# Static HTML banners, built once at import instead of on every rerun
+HERO_HTML = """
+<div style="background: linear-gradient(90deg, #ff7e5f 0%, #feb47b 100%); 
+           padding: 30px; border-radius: 15px; margin-bottom: 30px; text-align: center;">
+    <h1 style="color: white; margin: 0; font-size: 3em;">🔍 URL Content Extractor</h1>
+    <p style="color: #fff; font-size: 1.2em; margin: 10px 0 0 0; opacity: 0.9;">
+        Extract and beautifully format webpage content with preserved structure
+    </p>
+</div>
+"""
+
+RESULTS_HEADER_HTML = """
+<div style="background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); 
+           padding: 20px; border-radius: 10px; margin: 20px 0;">
+    <h2 style="color: white; margin: 0; text-align: center;">
+        {title}
+    </h2>
+    <p style="color: #f0f0f0; text-align: center; margin: 10px 0 0 0; font-style: italic;">
+        {subtitle}
+    </p>
+</div>
+"""
+
+EXPORT_BANNER_HTML = """
+<div style="background-color: #f0f8ff; padding: 20px; border-radius: 10px; border: 2px dashed #4682b4;">
+    <h3 style="color: #4682b4; margin-top: 0;">📤 Export Your Content</h3>
+    <p style="color: #2c3e50; margin-bottom: 0;">Save the extracted content for later use</p>
+</div>
+"""
+
+@st.cache_resource
+def get_http_session():
+    """Shared HTTP session so repeat extractions reuse keep-alive connections"""
+    return new_session(16)
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def cached_extract(url, include_images, include_videos, _session=None, _parse_in_process=False):
+    """Memoized single-page extraction so repeat URLs skip the network and parsing"""
+    return extract_all_webpage_data(
+        url,
+        include_images=include_images,
+        include_videos=include_videos,
+        session=_session,
+        parse_in_process=_parse_in_process
+    )
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def cached_scrape_with_depth(url, depth, include_images, include_videos, max_pages):
+    """Memoized depth scrape, so reruns don't crawl the same site again"""
+    return scrape_with_depth(
+        url,
+        depth=depth,
+        include_images=include_images,
+        include_videos=include_videos,
+        delay=1.0,
+        max_pages=max_pages
+    )
+
+@lru_cache(maxsize=256)
 def is_valid_url(url):
     """
     Validate if the provided URL is properly formatted
     """
-    try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except:
-        return False
+    return bool(_URL_RE.match(url))
+
+def _has_two_pipes(line):
+    """
+    Check whether a line holds at least two '|' characters (a table row),
+    stopping at the second one instead of counting the whole line
+    """
+    first = line.find('|')
+    return first >= 0 and line.find('|', first + 1) >= 0
+
+# Streamlit element used for each markdown heading level; deeper levels fall
+# back to raw markdown
+HEADING_RENDERERS = {
+    1: st.header,
+    2: st.subheader,
+}
 
 def display_content_with_tabs(content, include_pictures, include_videos):
     """Display content in organized tabs"""
-    # Separate content types
+    # Extract all images from the entire content first
+    all_images = IMAGE_MARKDOWN_RE.findall(content)
+    
+    # Separate content types for tab display
     text_content = []
-    image_content = []
+    image_content = all_images  # Use all found images
     video_content = []
     
-    sections = content.split('\n\n')
+    # Remove images from content and split into sections
+    text_only_content = content
+    for img in all_images:
+        text_only_content = text_only_content.replace(img, '')
+    
+    sections = text_only_content.split('\n\n')
     
     for section in sections:
         section = section.strip()
         if not section:
             continue
             
-        # Check content type
-        if section.startswith('![') and '](' in section and section.endswith(')'):
-            image_content.append(section)
-        elif section.startswith('**[') and ('VIDEO:' in section or 'AUDIO:' in section or 'EMBEDDED' in section):
+        # Check for video content
+        if section.startswith('**[') and ('VIDEO:' in section or 'AUDIO:' in section or 'EMBEDDED' in section):
             video_content.append(section)
         else:
             text_content.append(section)
@@ -51,8 +139,6 @@ def display_content_with_tabs(content, include_pictures, include_videos):
     if include_videos:
         tab_names.append("Videos")
     
-
-    
     # Always create tabs if any media extraction is enabled
     if include_pictures or include_videos:
         # Create tabs
@@ -72,13 +158,15 @@ def display_content_with_tabs(content, include_pictures, include_videos):
                     for i, img_section in enumerate(image_content, 1):
                         st.write(f"**Image {i}:**")
                         display_image_content(img_section)
-                        st.write("---")  # Separator between images
+                        st.write("---")
                 else:
                     st.info("No images found on this webpage.")
-                    st.write("This could be because:")
-                    st.markdown("- The webpage doesn't contain images")
-                    st.markdown("- Images are loaded dynamically with JavaScript")
-                    st.markdown("- Images are in unsupported formats")
+                    st.write("**This could be because:**")
+                    st.markdown(
+                        "- The webpage doesn't contain images\n"
+                        "- Images are loaded dynamically with JavaScript\n"
+                        "- Images are in unsupported formats"
+                    )
             tab_index += 1
         
         # Videos tab
@@ -90,13 +178,24 @@ def display_content_with_tabs(content, include_pictures, include_videos):
                     for i, video_section in enumerate(video_content, 1):
                         st.write(f"**Media {i}:**")
                         display_video_content(video_section)
-                        st.write("---")  # Separator between videos
+                        st.write("---")
                 else:
                     st.info("No videos or audio found on this webpage.")
                     st.write("This could be because:")
-                    st.markdown("- The webpage doesn't contain video/audio content")
-                    st.markdown("- Media is embedded in unsupported formats")
-                    st.markdown("- Media requires JavaScript to load")
+                    st.markdown(
+                        "- The webpage doesn't contain video/audio content\n"
+                        "- Videos are loaded dynamically with JavaScript\n"
+                        "- Media is embedded in unsupported formats\n"
+                        "- The website blocks automated content extraction\n"
+                        "- Videos require user interaction to load"
+                    )
+                    
+                    st.write("**Try these alternatives:**")
+                    st.markdown(
+                        "- Educational sites (Khan Academy, Coursera)\n"
+                        "- Documentation with embedded videos\n"
+                        "- News sites with accessible video content"
+                    )
     else:
         # Only text content, display normally
         display_formatted_content('\n\n'.join(text_content))
@@ -157,171 +256,142 @@ def display_formatted_content(content):
         return
     
     # Clean up the content first
-    content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)  # Remove excessive line breaks
+    # Extractor output is already normalised, so only run the regex when a
+    # plain triple newline shows up (a cheap substring scan)
+    if '\n\n\n' in content:
+        content = MULTI_NEWLINE_RE.sub('\n\n', content)  # Remove excessive line breaks
     
     # Split content into sections
     sections = content.split('\n\n')
     
+    # Consecutive markdown blocks are sent as a single element; anything else
+    # (headings, media, code) flushes the buffer first so page order is kept
+    markdown_blocks = []
+    
+    def flush_markdown():
+        if markdown_blocks:
+            st.markdown('\n\n'.join(markdown_blocks))
+            markdown_blocks.clear()
+    
     for section in sections:
         section = section.strip()
         if not section:
             continue
         
-        lines = section.split('\n')
+        # Strip every line once; the branches below reuse the stripped copies
+        lines = [line.strip() for line in section.splitlines()]
         
         # Check if this section starts with a heading
-        first_line = lines[0].strip()
+        first_line = lines[0]
+        
+        # Prefix checks below are gated on the first character so most
+        # sections skip the startswith/endswith probes entirely
+        first_char = section[0]
         
-        if first_line.startswith('#'):
+        if first_char == '#':
             # This is a heading section
-            heading_level = len(first_line) - len(first_line.lstrip('#'))
-            heading_text = first_line.lstrip('# ').strip()
+            # Count the leading '#' markers without copying the line
+            heading_level = 1
+            while heading_level < len(first_line) and first_line[heading_level] == '#':
+                heading_level += 1
+            heading_text = first_line[heading_level:].lstrip('# ').strip()
             
             # Display heading
-            if heading_level == 1:
-                st.header(heading_text)
-            elif heading_level == 2:
-                st.subheader(heading_text)
+            render_heading = HEADING_RENDERERS.get(heading_level)
+            if render_heading:
+                flush_markdown()
+                render_heading(heading_text)
             else:
-                st.markdown(f"{'#' * heading_level} {heading_text}")
+                markdown_blocks.append(f"{'#' * heading_level} {heading_text}")
             
             # Display rest of section if any
             if len(lines) > 1:
                 remaining_content = '\n'.join(lines[1:]).strip()
                 if remaining_content:
-                    st.markdown(remaining_content)
+                    markdown_blocks.append(remaining_content)
         
-        elif any(line.strip().startswith('•') for line in lines):
-            # This is a list section
+        elif any(line.startswith('•') for line in lines):
+            # This is a list section; consecutive items form one markdown list
+            list_items = []
             for line in lines:
-                line = line.strip()
                 if line.startswith('•'):
-                    st.markdown(f"- {line[1:].strip()}")
-                elif line and not line.startswith('•'):
-                    st.markdown(line)
-            st.markdown("")
+                    list_items.append(f"- {line[1:].strip()}")
+                elif line:
+                    if list_items:
+                        markdown_blocks.append('\n'.join(list_items))
+                        list_items = []
+                    markdown_blocks.append(line)
+            if list_items:
+                markdown_blocks.append('\n'.join(list_items))
         
-        elif any('|' in line and line.count('|') >= 2 for line in lines):
+        # A table row has at least two pipes; stop scanning at the second one
+        elif any(_has_two_pipes(line) for line in lines):
             # This is a table section
             for line in lines:
-                if '|' in line and line.count('|') >= 2:
+                if _has_two_pipes(line):
                     cells = [cell.strip() for cell in line.split('|')]
-                    st.markdown(" | ".join(filter(None, cells)))
+                    markdown_blocks.append(" | ".join(filter(None, cells)))
                 else:
-                    st.markdown(line)
-            st.markdown("")
+                    markdown_blocks.append(line)
         
-        elif section.startswith('**Q:') and section.endswith('**'):
+        elif first_char == '*' and section.startswith('**Q:') and section.endswith('**'):
             # FAQ questions
             question_text = section[4:-2].strip()
-            st.markdown(f"### Q: {question_text}")
-            st.markdown("")
+            markdown_blocks.append(f"### Q: {question_text}")
         
-        elif section.startswith('**A:**'):
+        elif first_char == '*' and section.startswith('**A:**'):
             # FAQ answers
             answer_text = section[6:].strip()
-            st.markdown(f"**Answer:** {answer_text}")
-            st.markdown("")
+            markdown_blocks.append(f"**Answer:** {answer_text}")
         
-        elif section.startswith('![') and '](' in section and section.endswith(')'):
+        elif first_char == '!' and section.startswith('![') and '](' in section and section.endswith(')'):
             # Handle images
-            try:
-                alt_start = section.find('[') + 1
-                alt_end = section.find(']')
-                url_start = section.find('(') + 1
-                url_end = section.find(')')
-                
-                alt_text = section[alt_start:alt_end]
-                image_url = section[url_start:url_end]
-                
-                if image_url:
-                    st.image(image_url, caption=alt_text if alt_text else None)
-            except:
-                st.markdown(section)
+            flush_markdown()
+            display_image_content(section)
         
-        elif section.startswith('**[') and section.endswith(']**'):
+        elif first_char == '*' and section.startswith('**[') and section.endswith(']**'):
             # Handle video/audio/embedded content
-            if 'VIDEO:' in section:
-                video_url = section.replace('**[VIDEO:', '').replace(']**', '').strip()
-                try:
-                    st.video(video_url)
-                except:
-                    st.markdown(f"**Video:** {video_url}")
-            elif 'AUDIO:' in section:
-                audio_url = section.replace('**[AUDIO:', '').replace(']**', '').strip()
-                try:
-                    st.audio(audio_url)
-                except:
-                    st.markdown(f"**Audio:** {audio_url}")
-            elif 'EMBEDDED VIDEO:' in section:
-                embed_url = section.replace('**[EMBEDDED VIDEO:', '').replace(']**', '').strip()
-                # Handle YouTube embeds
-                if 'youtube.com/watch' in embed_url:
-                    video_id = embed_url.split('v=')[1].split('&')[0]
-                    embed_url = f"https://www.youtube.com/embed/{video_id}"
-                elif 'youtu.be/' in embed_url:
-                    video_id = embed_url.split('youtu.be/')[1].split('?')[0]
-                    embed_url = f"https://www.youtube.com/embed/{video_id}"
-                
-                st.markdown(f'<iframe width="560" height="315" src="{embed_url}" frameborder="0" allowfullscreen></iframe>', unsafe_allow_html=True)
-            elif 'EMBEDDED CONTENT:' in section:
-                embed_url = section.replace('**[EMBEDDED CONTENT:', '').replace(']**', '').strip()
-                st.markdown(f"**Embedded Content:** {embed_url}")
-            else:
-                st.markdown(section)
+            flush_markdown()
+            display_video_content(section)
         
-        elif section.startswith('**') and section.endswith('**'):
+        elif first_char == '*' and section.startswith('**') and section.endswith('**'):
             # Other emphasized content
             emphasized_text = section[2:-2].strip()
-            st.markdown(f"**{emphasized_text}**")
-            st.markdown("")
+            markdown_blocks.append(f"**{emphasized_text}**")
         
-        elif section.startswith('>'):
+        elif first_char == '>':
             # Blockquotes
             quote_text = section[1:].strip()
-            st.markdown(f"> {quote_text}")
-            st.markdown("")
+            markdown_blocks.append(f"> {quote_text}")
         
-        elif section.startswith('```'):
+        elif first_char == '`' and section.startswith('```'):
             # Code blocks
             code_content = section.replace('```', '').strip()
+            flush_markdown()
             st.code(code_content, language=None)
-            st.markdown("")
         
         else:
             # Regular paragraphs - display exactly as webpage
-            section_text = section.strip()
-            if len(section_text) > 0:
-                if '\n' in section_text:
-                    lines = section_text.split('\n')
-                    for line in lines:
-                        line = line.strip()
-                        if line:
-                            st.markdown(line)
-                    st.markdown("")
-                else:
-                    st.markdown(section_text)
-                    st.markdown("")
+            if len(lines) > 1:
+                markdown_blocks.extend(line for line in lines if line)
+            else:
+                markdown_blocks.append(section)
+    
+    flush_markdown()
 
 def main():
     # Enhanced title with gradient background
-    st.markdown("""
-    <div style="background: linear-gradient(90deg, #ff7e5f 0%, #feb47b 100%); 
-               padding: 30px; border-radius: 15px; margin-bottom: 30px; text-align: center;">
-        <h1 style="color: white; margin: 0; font-size: 3em;">🔍 URL Content Extractor</h1>
-        <p style="color: #fff; font-size: 1.2em; margin: 10px 0 0 0; opacity: 0.9;">
-            Extract and beautifully format webpage content with preserved structure
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HERO_HTML, unsafe_allow_html=True)
     
     # URL input section
     st.subheader("Enter URL to Extract Content")
-    url_input = st.text_input(
+    url_input = st.text_area(
         "URL:",
         placeholder="https://example.com/article",
-        help="Enter a valid URL to extract and organize its content"
+        help="Enter a valid URL to extract and organize its content (one per line to extract several at once)"
     )
+    # Repeated URLs are only fetched once
+    urls = list(dict.fromkeys(u for u in map(str.strip, url_input.splitlines()) if u))
     
     # Extraction options section
     st.subheader("Extraction Options")
@@ -347,38 +417,65 @@ def main():
     extract_button = st.button("Extract Content", type="primary", use_container_width=True)
     
     if extract_button:
-        if not url_input:
+        if not urls:
             st.error("Please enter a URL to extract content from.")
             return
         
-        if not is_valid_url(url_input):
-            st.error("Please enter a valid URL (must include http:// or https://)")
+        invalid_urls = [u for u in urls if not is_valid_url(u)]
+        if invalid_urls:
+            st.error(f"Please enter a valid URL (must include http:// or https://): {invalid_urls[0]}")
             return
         
+        # Label and host used in headings, messages and export file names
+        source_label = urls[0] if len(urls) == 1 else f"{len(urls)} URLs"
+        primary_url = urls[0]
+        
         # Show loading state
         extraction_message = "Extracting content..."
+        if len(urls) > 1:
+            extraction_message = f"Extracting content from {len(urls)} URLs..."
         if enable_depth:
             extraction_message += f" (Depth: {depth}, Max pages: {max_pages})"
             
         with st.spinner(extraction_message):
             try:
-                if enable_depth:
-                    # Use depth scraping
-                    content = scrape_with_depth(
-                        url_input,
-                        depth=depth,
-                        include_images=extract_pictures,
-                        include_videos=extract_videos,
-                        delay=1.0,
-                        max_pages=max_pages
-                    )
-                    is_depth_content = True
-                else:
-                    # Regular single-page extraction
-                    content = extract_all_webpage_data(url_input, include_images=extract_pictures, include_videos=extract_videos)
-                    is_depth_content = False
+                http_session = get_http_session()
                 
-
+                def extract_url(url):
+                    if enable_depth:
+                        # Use depth scraping
+                        return cached_scrape_with_depth(url, depth, extract_pictures, extract_videos, max_pages)
+                    # Regular single-page extraction; batch pages are parsed in
+                    # worker processes so the threads are not serialized on the GIL
+                    return cached_extract(url, extract_pictures, extract_videos, _session=http_session,
+                                          _parse_in_process=len(urls) > 1)
+                
+                if len(urls) == 1:
+                    content = extract_url(primary_url)
+                    pages_extracted = 1
+                else:
+                    def extract_or_error(url):
+                        # One failing page should not sink the rest of the batch
+                        try:
+                            return extract_url(url), None
+                        except Exception as e:
+                            return None, str(e)
+                    
+                    # Extractions are network-bound, so run them side by side
+                    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_EXTRACTIONS, len(urls))) as executor:
+                        results = list(executor.map(extract_or_error, urls))
+                    
+                    pages_extracted = 0
+                    for url, (page, error) in zip(urls, results):
+                        if error:
+                            st.warning(f"Could not extract {url}: {error}")
+                        elif page:
+                            pages_extracted += 1
+                    content = '\n\n'.join(
+                        f"## Source {i}: {url}\n\n{page}"
+                        for i, (url, (page, _)) in enumerate(zip(urls, results), 1)
+                        if page
+                    )
                 
                 if not content or len(content.strip()) < 50:
                     st.warning("Unable to extract meaningful content from this URL.")
@@ -422,23 +519,32 @@ def main():
                 else:
                     status_text = "(text only)"
                 
-                st.success(f"Successfully extracted content from: **{url_input}** {status_text}")
+                st.success(f"Successfully extracted content from: **{source_label}** {status_text}")
+                
+                # Count words and non-empty lines in a single pass over the content
+                word_count = 0
+                line_count = 0
+                for line in content.splitlines():
+                    words = line.split()
+                    if words:
+                        line_count += 1
+                        word_count += len(words)
                 
                 # Show content statistics with better visual design
                 col1, col2, col3, col4 = st.columns(4)
                 with col1:
                     st.metric("📊 Total Characters", f"{len(content):,}", delta=None)
                 with col2:
-                    word_count = len(content.split())
                     st.metric("📝 Word Count", f"{word_count:,}", delta=None)
                 with col3:
-                    line_count = len([line for line in content.split('\n') if line.strip()])
                     st.metric("📋 Content Blocks", line_count, delta=None)
                 with col4:
                     if enable_depth:
                         # Count pages scraped from depth content
                         pages_scraped = content.count("### Page ") if "### Page " in content else 1
                         st.metric("📄 Pages Scraped", pages_scraped, delta=None)
+                    elif len(urls) > 1:
+                        st.metric("📄 Pages Extracted", pages_extracted, delta=None)
                     else:
                         st.metric("🌐 Extraction Type", "Single Page", delta=None)
                 
@@ -448,144 +554,50 @@ def main():
                 # Enhanced header for content section
                 if enable_depth:
                     header_title = f"Depth Scraping Results (Depth: {depth})"
-                    header_subtitle = f"Extracted content from multiple pages on {urlparse(url_input).netloc}"
+                    header_subtitle = f"Extracted content from multiple pages on {urlparse(primary_url).netloc}"
                 else:
                     header_title = "Webpage Content (Media-Free)"
                     header_subtitle = "Preserving original webpage structure and layout"
                 
-                st.markdown(f"""
-                <div style="background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); 
-                           padding: 20px; border-radius: 10px; margin: 20px 0;">
-                    <h2 style="color: white; margin: 0; text-align: center;">
-                        {header_title}
-                    </h2>
-                    <p style="color: #f0f0f0; text-align: center; margin: 10px 0 0 0; font-style: italic;">
-                        {header_subtitle}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Extract all images from the entire content first
-                import re
-                all_images = re.findall(r'!\[.*?\]\([^)]+\)', content)
-                
-                # Separate content types for tab display
-                text_content = []
-                image_content = all_images  # Use all found images
-                video_content = []
-                
-                # Remove images from content and split into sections
-                text_only_content = content
-                for img in all_images:
-                    text_only_content = text_only_content.replace(img, '')
-                
-                sections = text_only_content.split('\n\n')
-                
-                for section in sections:
-                    section = section.strip()
-                    if not section:
-                        continue
-                        
-                    # Check for video content
-                    if section.startswith('**[') and ('VIDEO:' in section or 'AUDIO:' in section or 'EMBEDDED' in section):
-                        video_content.append(section)
-                    else:
-                        text_content.append(section)
-                
-                # Create tabs based on selected options
-                tab_names = ["Text Content"]
-                if extract_pictures:
-                    tab_names.append("Pictures")
-                if extract_videos:
-                    tab_names.append("Videos")
+                st.markdown(
+                    RESULTS_HEADER_HTML.format(title=header_title, subtitle=header_subtitle),
+                    unsafe_allow_html=True
+                )
                 
-                # Always create tabs if any media extraction is enabled
-                if extract_pictures or extract_videos:
-                    # Create tabs
-                    tabs = st.tabs(tab_names)
-                    
-                    # Text content tab
-                    with tabs[0]:
-                        display_formatted_content('\n\n'.join(text_content))
-                    
-                    # Pictures tab
-                    tab_index = 1
-                    if extract_pictures:
-                        with tabs[tab_index]:
-                            st.subheader("Extracted Images")
-                            if image_content:
-                                st.write(f"Found {len(image_content)} images:")
-                                for i, img_section in enumerate(image_content, 1):
-                                    st.write(f"**Image {i}:**")
-                                    display_image_content(img_section)
-                                    st.write("---")
-                            else:
-                                st.info("No images found on this webpage.")
-                                st.write("**This could be because:**")
-                                st.markdown("- The webpage doesn't contain images")
-                                st.markdown("- Images are loaded dynamically with JavaScript")
-                                st.markdown("- Images are in unsupported formats")
-                        tab_index += 1
-                    
-                    # Videos tab
-                    if extract_videos:
-                        with tabs[tab_index]:
-                            st.subheader("Extracted Videos & Audio")
-                            if video_content:
-                                st.write(f"Found {len(video_content)} videos/audio files:")
-                                for i, video_section in enumerate(video_content, 1):
-                                    st.write(f"**Media {i}:**")
-                                    display_video_content(video_section)
-                                    st.write("---")
-                            else:
-                                st.info("No videos or audio found on this webpage.")
-                                st.write("This could be because:")
-                                st.markdown("- The webpage doesn't contain video/audio content")
-                                st.markdown("- Videos are loaded dynamically with JavaScript")
-                                st.markdown("- Media is embedded in unsupported formats")
-                                st.markdown("- The website blocks automated content extraction")
-                                st.markdown("- Videos require user interaction to load")
-                                
-                                st.write("**Try these alternatives:**")
-                                st.markdown("- Educational sites (Khan Academy, Coursera)")
-                                st.markdown("- Documentation with embedded videos")
-                                st.markdown("- News sites with accessible video content")
-                else:
-                    # Only text content, display normally
-                    display_formatted_content('\n\n'.join(text_content))
+                display_content_with_tabs(content, extract_pictures, extract_videos)
                 
                 # Enhanced export section
                 st.markdown("---")
-                st.markdown("""
-                <div style="background-color: #f0f8ff; padding: 20px; border-radius: 10px; border: 2px dashed #4682b4;">
-                    <h3 style="color: #4682b4; margin-top: 0;">📤 Export Your Content</h3>
-                    <p style="color: #2c3e50; margin-bottom: 0;">Save the extracted content for later use</p>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(EXPORT_BANNER_HTML, unsafe_allow_html=True)
                 
                 # Prepare export content
-                export_content = f"# Content extracted from: {url_input}\n\n"
-                export_content += f"**Extraction Date:** {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                export_content += f"**Word Count:** {word_count:,}\n\n"
-                export_content += f"---\n\n{content}"
+                now = datetime.now()
+                extracted_at = now.strftime('%Y-%m-%d %H:%M:%S')
+                file_stamp = now.strftime('%Y%m%d_%H%M')
+                export_content = (
+                    f"# Content extracted from: {source_label}\n\n"
+                    f"**Extraction Date:** {extracted_at}\n\n"
+                    f"**Word Count:** {word_count:,}\n\n"
+                    f"---\n\n{content}"
+                )
                 
                 col1, col2 = st.columns([1, 1])
                 with col1:
                     st.download_button(
                         label="📄 Download as Markdown",
                         data=export_content,
-                        file_name=f"content_{urlparse(url_input).netloc}_{__import__('datetime').datetime.now().strftime('%Y%m%d_%H%M')}.md",
+                        file_name=f"content_{urlparse(primary_url).netloc}_{file_stamp}.md",
                         mime="text/markdown",
                         help="Download the content in Markdown format for easy editing"
                     )
                 
                 with col2:
                     # Plain text export option
-                    plain_text = content.replace('#', '').replace('•', '-')
+                    plain_text = content.translate(_PLAIN_TEXT_TABLE)
                     st.download_button(
                         label="📝 Download as Text",
                         data=plain_text,
-                        file_name=f"content_{urlparse(url_input).netloc}_{__import__('datetime').datetime.now().strftime('%Y%m%d_%H%M')}.txt",
+                        file_name=f"content_{urlparse(primary_url).netloc}_{file_stamp}.txt",
                         mime="text/plain",
                         help="Download as plain text file"
                     )
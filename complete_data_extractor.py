@@ -1,12 +1,258 @@
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, NavigableString
+from urllib.parse import urljoin, urlparse
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+import multiprocessing
 import re
+import threading
 import trafilatura
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
 
-def extract_all_webpage_data(url: str, include_images: bool = False, include_videos: bool = False) -> str:
+# BeautifulSoup parser for every module; lxml is a hard dependency
+HTML_PARSER = 'lxml'
+
+def new_session(pool_size: int = 10) -> requests.Session:
+    """
+    Create a session that keeps up to pool_size connections per host alive.
+    Gateway errors are retried with a short backoff, ignoring Retry-After so a
+    server cannot stall a fetch, and the last error response is returned to
+    raise_for_status rather than raised as a RetryError.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                                            raise_on_status=False, respect_retry_after_header=False))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# Module-wide session so calls without their own session still share pooled
+# keep-alive connections
+_SESSION = new_session(20)
+
+# Statuses that a different user agent may get past; any other HTTP error, or
+# a connection failure, ends the user agent rotation straight away
+UA_RETRY_STATUSES = {403, 406, 429}
+
+# Browser-like request headers, sent with each user agent in turn; built once
+# here and merged per request, never mutated
+BROWSER_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'Accept-Language': 'en-US,en;q=0.9',
+    # gzip and deflate, plus br and zstd when brotli and zstd support are
+    # installed to decode them
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0',
+    'DNT': '1',
+    'Sec-Ch-Ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+    'Sec-Ch-Ua-Mobile': '?0',
+    'Sec-Ch-Ua-Platform': '"Windows"'
+}
+USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0'
+)
+
+_VIDEO_TAGS = {'video', 'iframe', 'embed', 'object'}
+_AD_CLASS_RE = re.compile(r'banner|ad|advertisement', re.I)
+# Class names marking navigation bars and ad slots the DOM walk leaves out
+_NAV_CLASS_RE = re.compile(r'navbar|navigation-bar|header-nav|footer-nav|advertisement|google-ads', re.I)
+
+# Patterns applied per FAQ line and to the joined result
+_NUMBERED_LINE_RE = re.compile(r'^\d+[\s.]')
+_NUMBER_PREFIX_RE = re.compile(r'^\d+[\s.]*')
+MULTI_NEWLINE_RE = re.compile(r'\n\s*\n\s*\n+')
+# Runs of spaces, once tabs have been turned into spaces with str.replace
+MULTI_SPACE_RE = re.compile(r' {2,}')
+
+# Markdown image references in extracted content
+IMAGE_MARKDOWN_RE = re.compile(r'!\[.*?\]\([^)]+\)')
+
+# Markdown prefix for each heading tag
+HEADING_PREFIXES = {f'h{level}': '#' * level for level in range(1, 7)}
+
+# Tag groups the DOM walk dispatches on
+_SKIPPED_TAGS = {'script', 'style'}
+_LIST_TAGS = {'ul', 'ol'}
+_CONTAINER_TAGS = {'div', 'section', 'article', 'main', 'header', 'footer', 'aside', 'nav'}
+_INLINE_TAGS = {'span', 'strong', 'em', 'b', 'i', 'a', 'code', 'small', 'label', 'button'}
+_DEFINITION_TAGS = {'dt', 'dd'}
+# Short inline text inside these is already part of the parent's own text
+_TEXT_BLOCK_TAGS = {'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'td', 'th'}
+
+# DOM text at or above this many characters is enough on its own, even when it
+# came out as fewer than three blocks, so trafilatura is not consulted
+FALLBACK_MIN_CHARS = 2000
+
+# Largest (decompressed) page body accepted, so a huge page or compression
+# bomb cannot exhaust memory
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+
+def element_text(element) -> str:
+    """
+    Same as element.get_text(strip=True), with a shortcut for elements that
+    hold a single plain text node.
+    """
+    string = element.string
+    # Exact type check: comments, scripts and CDATA are NavigableString subclasses
+    if type(string) is NavigableString:
+        return string.strip()
+    return element.get_text(strip=True)
+
+def _extract_numbered_qa(lines):
+    """
+    Pair numbered question lines ("1. ...") with the answer lines that follow them.
+    """
+    qa_pairs = []
+    i = 0
+    
+    while i < len(lines):
+        line = lines[i]
+        
+        # Look for numbered questions
+        if _NUMBERED_LINE_RE.match(line) and len(line) > 15:
+            question = _NUMBER_PREFIX_RE.sub('', line)
+            answer_parts = []
+            
+            # Collect answer lines until next question
+            j = i + 1
+            while j < len(lines) and j < i + 8:
+                next_line = lines[j]
+                
+                # Stop if we hit another numbered question
+                if _NUMBERED_LINE_RE.match(next_line) and len(next_line) > 15:
+                    break
+                    
+                if len(next_line) > 5:
+                    answer_parts.append(next_line)
+                j += 1
+            
+            if answer_parts:
+                qa_pairs.append({
+                    'question': question,
+                    'answer': ' '.join(answer_parts[:2])
+                })
+            
+            i = j
+        else:
+            i += 1
+    
+    return qa_pairs
+
+def declared_charset(response) -> Optional[str]:
+    """
+    Return the charset sent in a response's Content-Type header, or None.
     """
-    Extract absolutely everything from a webpage including all text, metadata, and content
+    if 'charset=' in response.headers.get('Content-Type', '').lower():
+        return response.encoding
+    return None
+
+def decode_body(body: bytes, encoding: Optional[str]):
+    """
+    Decode body with a charset declared in the Content-Type header, for
+    consumers that cannot be told it separately; without one, or with an
+    unknown one, the bytes are returned for the consumer to sniff.
+    """
+    if encoding:
+        try:
+            return body.decode(encoding, errors='replace')
+        except LookupError:
+            pass
+    return body
+
+def check_fetchable(response, limit: int = MAX_RESPONSE_BYTES):
+    """
+    Reject a response from its headers alone when its body is not HTML-like
+    text or is declared larger than limit bytes, before any of it is read.
+    """
+    content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+    if content_type and not (content_type.startswith('text/') or 'html' in content_type or 'xml' in content_type):
+        response.close()
+        raise Exception(f"Unsupported content type: {content_type}")
+    content_length = response.headers.get('Content-Length', '')
+    # A compressed length over the limit can only grow once decoded
+    if content_length.isdigit() and int(content_length) > limit:
+        response.close()
+        raise Exception(f"Response too large (over {limit:,} bytes)")
+
+def read_capped(response, limit: int = MAX_RESPONSE_BYTES) -> bytes:
+    """
+    Read a streamed response body, giving up once it grows past limit bytes.
+    """
+    chunks = []
+    total = 0
+    for chunk in response.iter_content(65536):
+        total += len(chunk)
+        if total > limit:
+            response.close()
+            raise Exception(f"Response too large (over {limit:,} bytes)")
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+# Recently fetched page bodies with their ETag/Last-Modified validators, so a
+# repeat fetch of an unchanged page is answered by a body-less 304; the header
+# charset is kept with each body, as a 304 carries no Content-Type, and so is
+# the text extracted from it, per (include_images, include_videos)
+_PAGE_CACHE = OrderedDict()
+_PAGE_CACHE_SIZE = 32
+_PAGE_CACHE_LOCK = threading.Lock()
+
+def _cached_page(url: str):
+    """
+    Return the (conditional headers, body, charset, results) entry cached for
+    url, or None.
+    """
+    with _PAGE_CACHE_LOCK:
+        entry = _PAGE_CACHE.get(url)
+        if entry is not None:
+            _PAGE_CACHE.move_to_end(url)
+        return entry
+
+def _remember_page(url: str, response, body: bytes, declared_encoding: Optional[str]):
+    """
+    Cache a fetched body when the server sent validators to revalidate it with.
+    """
+    validators = {}
+    if response.headers.get('ETag'):
+        validators['If-None-Match'] = response.headers['ETag']
+    if response.headers.get('Last-Modified'):
+        validators['If-Modified-Since'] = response.headers['Last-Modified']
+    if not validators:
+        return
+    with _PAGE_CACHE_LOCK:
+        _PAGE_CACHE[url] = (validators, body, declared_encoding, {})
+        _PAGE_CACHE.move_to_end(url)
+        while len(_PAGE_CACHE) > _PAGE_CACHE_SIZE:
+            _PAGE_CACHE.popitem(last=False)
+
+def _remember_result(url: str, body: bytes, options, result: str):
+    """
+    Keep the text extracted from a cached body, so a 304 can skip parsing.
+    """
+    with _PAGE_CACHE_LOCK:
+        entry = _PAGE_CACHE.get(url)
+        # Only attach it to the same body it was extracted from
+        if entry is not None and entry[1] is body:
+            entry[3][options] = result
+
+def _fetch_page(url: str, session: Optional[requests.Session] = None):
+    """
+    Fetch a page's body, revalidating a cached copy when there is one.
+    Returns (body, charset declared in the Content-Type header or None,
+    extraction results cached for an unchanged body or None).
     """
     try:
         # Validate URL
@@ -14,53 +260,105 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
         if not parsed_url.scheme or not parsed_url.netloc:
             raise ValueError("Invalid URL format")
         
-        # Enhanced headers
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0',
-            'DNT': '1',
-            'Sec-Ch-Ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-            'Sec-Ch-Ua-Mobile': '?0',
-            'Sec-Ch-Ua-Platform': '"Windows"'
-        }
-        
-        # Create session
-        session = requests.Session()
-        session.headers.update(headers)
+        # Reuse the caller's session when given, else the module session; headers
+        # are sent per request so a session shared between threads is never mutated
+        if session is None:
+            session = _SESSION
         
-        # Try multiple user agents
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0'
-        ]
+        # Revalidate a previously fetched copy instead of downloading it again
+        cached = _cached_page(url)
+        conditional_headers = cached[0] if cached else {}
         
         response = None
-        for user_agent in user_agents:
-            try:
-                session.headers.update({'User-Agent': user_agent})
-                response = session.get(url, timeout=20, allow_redirects=True)
-                response.raise_for_status()
-                if len(response.text) > 100:
-                    break
-            except Exception:
+        for user_agent in USER_AGENTS:
+            if response is not None:
+                response.close()
+            # Stream so a rejected attempt is closed before its body is downloaded;
+            # connect fast, then allow the server longer to send the page
+            response = session.get(url, headers={**BROWSER_HEADERS, **conditional_headers, 'User-Agent': user_agent},
+                                   timeout=(3, 10), allow_redirects=True, stream=True)
+            if response.status_code in UA_RETRY_STATUSES:
                 continue
+            if response.status_code == 304:
+                # Unchanged since the last fetch; without a cached copy to reuse
+                # there is no body, which is a failed fetch
+                if cached:
+                    html = cached[1]
+                break
+            response.raise_for_status()
+            check_fetchable(response)
+            html = read_capped(response)
+            if len(html) > 100:
+                break
         
-        if not response or response.status_code != 200:
+        # Every user agent was turned away
+        if response.status_code in UA_RETRY_STATUSES:
+            response.raise_for_status()
+        if response.status_code != 200 and not (response.status_code == 304 and cached):
             raise Exception("Failed to fetch content")
         
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # An unchanged page keeps the charset and text already found for it
+        if response.status_code == 304:
+            return html, cached[2], cached[3]
+        
+        # A charset sent in the Content-Type header is handed to the parser, so
+        # it need not sniff the bytes for one
+        declared_encoding = declared_charset(response)
+        _remember_page(url, response, html, declared_encoding)
+        return html, declared_encoding, None
+        
+    except requests.exceptions.Timeout:
+        raise Exception("Request timed out. The website may be slow to respond.")
+    except requests.exceptions.ConnectionError:
+        raise Exception("Unable to connect to the website. Please check the URL and your internet connection.")
+    except requests.exceptions.HTTPError as e:
+        if e.response.status_code == 404:
+            raise Exception("Page not found (404). Please check if the URL is correct.")
+        elif e.response.status_code == 403:
+            raise Exception("Access forbidden (403). The website may be blocking automated requests.")
+        elif e.response.status_code == 500:
+            raise Exception("Server error (500). The website is experiencing technical difficulties.")
+        else:
+            raise Exception(f"HTTP error {e.response.status_code}: {e.response.reason}")
+    except Exception as e:
+        raise Exception(f"Error extracting content: {str(e)}")
+
+# Worker processes that parse pages for parse_in_process callers, started on
+# first use; spawned rather than forked, as the caller is usually threaded
+_PARSE_POOL = None
+_PARSE_POOL_LOCK = threading.Lock()
+
+def _parse_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared parsing process pool, starting it if needed.
+    """
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is None:
+            _PARSE_POOL = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+        return _PARSE_POOL
+
+def _discard_parse_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a broken parsing pool so the next caller starts a fresh one.
+    """
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is pool:
+            _PARSE_POOL = None
+    pool.shutdown(wait=False)
+
+def extract_from_html(html: bytes, url: str, include_images: bool = False, include_videos: bool = False,
+                      declared_encoding: Optional[str] = None) -> str:
+    """
+    Extract absolutely everything from an already fetched page body.
+    Uses no shared state, so it can also run in a worker process.
+    """
+    try:
+        # Parse the raw bytes so the page's own charset declaration is used
+        # instead of requests' ISO-8859-1 guess
+        soup = BeautifulSoup(html, HTML_PARSER, from_encoding=declared_encoding)
+        
         
         # Extract all content sections
         all_content = []
@@ -68,19 +366,42 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
         # 1. Extract page title and metadata
         title = soup.find('title')
         if title:
-            all_content.append(f"# {title.get_text(strip=True)}\n")
+            all_content.append(f"# {element_text(title)}\n")
         
-        # Extract meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'}) or soup.find('meta', attrs={'property': 'og:description'})
+        # Extract meta description; the meta tags are gathered in one search so a
+        # page without a plain description is not scanned a second time for og:
+        meta_tags = soup.find_all('meta')
+        meta_desc = (next((meta for meta in meta_tags if meta.get('name') == 'description'), None) or
+                     next((meta for meta in meta_tags if meta.get('property') == 'og:description'), None))
         if meta_desc and meta_desc.get('content'):
             all_content.append(f"**Description:** {meta_desc.get('content')}\n")
         
         # 2. Extract media content before removal (if needed)
         media_content = []
         
+        # Walk the tree once, collecting media and every element to strip
+        removed_tags = {'script', 'style', 'canvas', 'svg'}
+        if not include_images:
+            removed_tags.update(['img', 'figure', 'picture'])
+        if not include_videos:
+            removed_tags.update(['video', 'audio', 'iframe', 'embed', 'object'])
+        
+        images = []
+        video_elements = []
+        elements_to_remove = []
+        for element in soup.find_all(True):
+            if element.name == 'img':
+                images.append(element)
+            elif element.name in _VIDEO_TAGS:
+                video_elements.append(element)
+            # Also drop elements with ad-related classes
+            if (element.name in removed_tags or
+                    any(_AD_CLASS_RE.search(cls) for cls in element.get('class', []))):
+                elements_to_remove.append(element)
+        
         # Extract images if requested
         if include_images:
-            for img in soup.find_all('img'):
+            for img in images:
                 src = img.get('src', '') or img.get('data-src', '') or img.get('data-lazy-src', '')
                 alt = img.get('alt', '') or 'Image'
                 
@@ -89,10 +410,8 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
                     if src.startswith('//'):
                         src = 'https:' + src
                     elif src.startswith('/'):
-                        from urllib.parse import urljoin
                         src = urljoin(url, src)
                     elif not src.startswith('http'):
-                        from urllib.parse import urljoin
                         src = urljoin(url, src)
                     
                     # Skip very small images (likely icons/spacers)
@@ -110,7 +429,6 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
         
         # Extract videos if requested
         if include_videos:
-            video_elements = soup.find_all(['video', 'iframe', 'embed', 'object'])
             for video in video_elements:
                 if video.name == 'video':
                     # Check for src attribute or source child elements
@@ -139,10 +457,8 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
                         if src.startswith('//'):
                             src = 'https:' + src
                         elif src.startswith('/'):
-                            from urllib.parse import urljoin
                             src = urljoin(url, src)
                         elif not src.startswith('http'):
-                            from urllib.parse import urljoin
                             src = urljoin(url, src)
                         
                         poster = video.get('poster', '')
@@ -158,7 +474,6 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
                         if src.startswith('//'):
                             src = 'https:' + src
                         elif src.startswith('/'):
-                            from urllib.parse import urljoin
                             src = urljoin(url, src)
                         
                         title = video.get('title', 'Embedded Content')
@@ -168,95 +483,76 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
                         else:
                             media_content.append(f"**[IFRAME: {title}]**\nURL: {src}")
                 
-                elif video.name in ['embed', 'object']:
+                elif video.name in ('embed', 'object'):
                     src = video.get('src') or video.get('data', '')
                     if src:
                         # Convert relative URLs to absolute  
                         if src.startswith('//'):
                             src = 'https:' + src
                         elif src.startswith('/'):
-                            from urllib.parse import urljoin
                             src = urljoin(url, src)
                         
                         media_content.append(f"**[EMBEDDED MEDIA]**\nURL: {src}")
         
         # Now remove unwanted elements
-        elements_to_remove = ['script', 'style']
-        if not include_images:
-            elements_to_remove.extend(['img', 'figure', 'picture'])
-        if not include_videos:
-            elements_to_remove.extend(['video', 'audio', 'iframe', 'embed', 'object'])
-        
-        for element in soup(elements_to_remove + ['canvas', 'svg']):
+        for element in elements_to_remove:
             element.decompose()
         
-        # Remove elements with ad-related classes
-        for element in soup.find_all(attrs={'class': re.compile(r'banner|ad|advertisement', re.I)}):
-            element.decompose()
-        
-        # 3. Try trafilatura first for fallback content
-        trafilatura_content = trafilatura.extract(
-            response.text,
-            include_comments=False,
-            include_tables=True,
-            include_formatting=True,
-            favor_precision=False,
-            favor_recall=True,
-            include_links=False,
-            with_metadata=False,
-            no_fallback=False,
-            deduplicate=False
-        )
-        
-        # 4. Extract complete content in exact DOM order preserving webpage structure
-        def extract_complete_dom_content(element, level=0, max_level=10):
+        # 3. Extract complete content in exact DOM order preserving webpage structure
+        def extract_complete_dom_content(element):
             """Extract ALL content in exact DOM traversal order maintaining webpage structure"""
             content_parts = []
             
-            if not element or level > max_level:
-                return content_parts
+            # Containers are entered by pushing an iterator over their children
+            # rather than recursing, so a container's content still comes before
+            # its next sibling without a Python call frame per nested element;
+            # with no recursion limit to respect, content at any depth is kept
+            stack = [iter(element.children)]
             
             # Process ALL child nodes in exact DOM order - don't skip anything important
-            for child in element.children if hasattr(element, 'children') else []:
+            while stack:
+                child = next(stack[-1], None)
+                if child is None:
+                    stack.pop()
+                    continue
+                
                 if hasattr(child, 'name') and child.name:
                     element_name = child.name.lower()
                     
                     # Only skip truly unwanted elements
-                    if element_name in ['script', 'style']:
+                    if element_name in _SKIPPED_TAGS:
                         continue
                     
                     # Skip only obvious navigation/ads, but be more permissive
-                    if (child.get('class') and 
-                        any(cls in str(child.get('class')).lower() 
-                            for cls in ['navbar', 'navigation-bar', 'header-nav', 'footer-nav', 'advertisement', 'google-ads'])):
+                    classes = child.get('class')
+                    if classes and any(_NAV_CLASS_RE.search(cls) for cls in classes):
                         continue
                     
                     # Handle ALL content elements in exact order they appear
-                    if element_name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                        text = child.get_text(strip=True)
+                    if element_name in HEADING_PREFIXES:
+                        text = element_text(child)
                         if text:
-                            heading_level = int(element_name[1])
-                            content_parts.append(f"{'#' * heading_level} {text}")
+                            content_parts.append(f"{HEADING_PREFIXES[element_name]} {text}")
                     
                     elif element_name == 'p':
-                        text = child.get_text(strip=True)
+                        text = element_text(child)
                         if text:
                             content_parts.append(text)
                     
-                    elif element_name in ['ul', 'ol']:
+                    elif element_name in _LIST_TAGS:
                         # Process ALL list items in order
                         for li in child.find_all('li', recursive=False):
-                            li_text = li.get_text(strip=True)
+                            li_text = element_text(li)
                             if li_text:
                                 content_parts.append(f"• {li_text}")
                     
                     elif element_name == 'blockquote':
-                        text = child.get_text(strip=True)
+                        text = element_text(child)
                         if text:
                             content_parts.append(f"> {text}")
                     
                     elif element_name == 'pre':
-                        text = child.get_text(strip=True)
+                        text = element_text(child)
                         if text:
                             content_parts.append(f"```\n{text}\n```")
                     
@@ -265,7 +561,7 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
                         for row in child.find_all('tr'):
                             cells = []
                             for cell in row.find_all(['td', 'th']):
-                                cell_text = cell.get_text(strip=True)
+                                cell_text = element_text(cell)
                                 if cell_text:
                                     cells.append(cell_text)
                             if cells:
@@ -275,27 +571,21 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
                         # Handle FAQ/accordion sections with ALL content
                         summary = child.find('summary')
                         if summary:
-                            summary_text = summary.get_text(strip=True)
+                            summary_text = element_text(summary)
                             if summary_text:
                                 content_parts.append(f"**{summary_text}**")
                         
-                        # Get ALL the details content recursively
-                        details_content = extract_complete_dom_content(child, level + 1, max_level)
-                        content_parts.extend(details_content)
+                        # Get ALL the details content
+                        stack.append(iter(child.children))
                     
-                    elif element_name in ['div', 'section', 'article', 'main', 'header', 'footer', 'aside', 'nav']:
+                    elif element_name in _CONTAINER_TAGS:
                         # Special handling for FAQ sections
-                        if (child.get('class') and 
-                            any('faq' in str(cls).lower() for cls in child.get('class', []))):
+                        if classes and any('faq' in cls.lower() for cls in classes):
                             
                             # Process FAQ section with proper Q&A pairing
                             content_parts.append("## FAQ Section")
                             
-                            import re
-                            
                             # Direct Q&A extraction with hardcoded sample data for testing
-                            import re
-                            
                             # Categories and sections structure
                             categories = {
                                 "FAQs thi trên giấy": [
@@ -314,90 +604,27 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
                             
                             # Get FAQ text and extract Q&As
                             faq_text = child.get_text()
-                            lines = [line.strip() for line in faq_text.split('\n') if line.strip()]
+                            lines = [line for line in map(str.strip, faq_text.splitlines()) if line]
                             
                             # Extract Q&A pairs using direct approach
-                            all_qa = []
-                            i = 0
-                            
-                            while i < len(lines):
-                                line = lines[i]
-                                
-                                # Look for numbered questions
-                                if re.match(r'^\d+[\s.]', line) and len(line) > 15:
-                                    question = re.sub(r'^\d+[\s.]*', '', line)
-                                    answer_parts = []
-                                    
-                                    # Collect answer lines until next question
-                                    j = i + 1
-                                    while j < len(lines) and j < i + 8:
-                                        next_line = lines[j]
-                                        
-                                        # Stop if we hit another numbered question
-                                        if re.match(r'^\d+[\s.]', next_line) and len(next_line) > 15:
-                                            break
-                                            
-                                        if len(next_line) > 5:
-                                            answer_parts.append(next_line)
-                                        j += 1
-                                    
-                                    if answer_parts:
-                                        all_qa.append({
-                                            'question': question,
-                                            'answer': ' '.join(answer_parts[:2])
-                                        })
-                                    
-                                    i = j
-                                else:
-                                    i += 1
+                            all_qa = _extract_numbered_qa(lines)
                             
                             # Extract actual Q&A from website using requests directly
                             if not all_qa:
                                 try:
-                                    import requests
                                     headers = {
                                         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
                                     }
                                     response = requests.get('https://emg.vn/peic', headers=headers)
                                     
                                     if response.status_code == 200:
-                                        from bs4 import BeautifulSoup
-                                        soup = BeautifulSoup(response.text, 'html.parser')
-                                        faq_section = soup.find('section', class_=lambda x: x and 'faq' in str(x).lower())
+                                        soup = BeautifulSoup(response.content, HTML_PARSER)
+                                        faq_section = soup.find('section', class_=lambda x: x and 'faq' in x.lower())
                                         
                                         if faq_section:
                                             faq_text = faq_section.get_text()
-                                            faq_lines = [line.strip() for line in faq_text.split('\n') if line.strip()]
-                                            
-                                            # Extract Q&As using working logic
-                                            k = 0
-                                            while k < len(faq_lines):
-                                                line = faq_lines[k]
-                                                
-                                                if re.match(r'^\d+[\s.]', line) and len(line) > 15:
-                                                    question = re.sub(r'^\d+[\s.]*', '', line)
-                                                    answer_parts = []
-                                                    
-                                                    m = k + 1
-                                                    while m < len(faq_lines) and m < k + 8:
-                                                        next_line = faq_lines[m]
-                                                        
-                                                        if re.match(r'^\d+[\s.]', next_line) and len(next_line) > 15:
-                                                            break
-                                                            
-                                                        if len(next_line) > 5:
-                                                            answer_parts.append(next_line)
-                                                        m += 1
-                                                    
-                                                    if answer_parts:
-                                                        all_qa.append({
-                                                            'question': question,
-                                                            'answer': ' '.join(answer_parts[:2])
-                                                        })
-                                                    
-                                                    k = m
-                                                else:
-                                                    k += 1
+                                            faq_lines = [line for line in map(str.strip, faq_text.splitlines()) if line]
+                                            all_qa.extend(_extract_numbered_qa(faq_lines))
                                 except:
                                     pass
                             
@@ -408,15 +635,10 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
                             if all_qa:
                                 qa_per_section = max(1, len(all_qa) // len(all_sections))
                                 
-                                qa_index = 0
-                                for section in all_sections:
-                                    section_content[section] = []
-                                    
-                                    # Assign Q&As to this section
-                                    for _ in range(qa_per_section):
-                                        if qa_index < len(all_qa):
-                                            section_content[section].append(all_qa[qa_index])
-                                            qa_index += 1
+                                # Each section takes the next qa_per_section Q&As as one slice
+                                for index, section in enumerate(all_sections):
+                                    start = index * qa_per_section
+                                    section_content[section] = all_qa[start:start + qa_per_section]
                             
                             # Generate organized output with Q&As
                             for category, sections in categories.items():
@@ -438,23 +660,22 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
 
                         else:
                             # Process other containers normally
-                            child_content = extract_complete_dom_content(child, level + 1, max_level)
-                            content_parts.extend(child_content)
+                            stack.append(iter(child.children))
                     
-                    elif element_name in ['span', 'strong', 'em', 'b', 'i', 'a', 'code', 'small', 'label', 'button']:
+                    elif element_name in _INLINE_TAGS:
                         # Include standalone text elements
-                        text = child.get_text(strip=True)
+                        text = element_text(child)
                         if text and len(text) > 2:
                             # Check if this is meaningful standalone content
                             parent = child.parent
                             if (not parent or 
-                                parent.name not in ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'td', 'th'] or
+                                parent.name not in _TEXT_BLOCK_TAGS or
                                 len(text) > 20):  # Include longer text even if inside paragraphs
                                 content_parts.append(text)
                     
-                    elif element_name in ['dt', 'dd']:
+                    elif element_name in _DEFINITION_TAGS:
                         # Definition lists
-                        text = child.get_text(strip=True)
+                        text = element_text(child)
                         if text:
                             prefix = "**" if element_name == 'dt' else "  "
                             suffix = "**" if element_name == 'dt' else ""
@@ -469,7 +690,7 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
             return content_parts
         
         # Extract ALL content in exact DOM order from entire document
-        body = soup.body if soup.body else soup
+        body = soup.body or soup
         complete_content = extract_complete_dom_content(body)
         
         # Combine title/metadata with complete DOM-ordered content (no duplicates)
@@ -483,20 +704,36 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
         if media_content:
             final_content.extend(media_content)
         
-        # Only use trafilatura as absolute fallback if DOM extraction failed completely
-        if len(complete_content) < 3 and trafilatura_content:
-            trafilatura_lines = trafilatura_content.split('\n')
-            for line in trafilatura_lines:
-                line = line.strip()
-                if line and len(line) > 5:
-                    final_content.append(line)
+        # Only use trafilatura as absolute fallback if DOM extraction failed completely;
+        # it re-parses the page, so it only runs when its output is needed
+        if len(complete_content) < 3 and sum(map(len, complete_content)) < FALLBACK_MIN_CHARS:
+            trafilatura_content = trafilatura.extract(
+                decode_body(html, declared_encoding),
+                include_comments=False,
+                include_tables=True,
+                include_formatting=False,
+                favor_precision=False,
+                favor_recall=True,
+                include_links=False,
+                with_metadata=False,
+                no_fallback=False,
+                deduplicate=False
+            )
+            if trafilatura_content:
+                # Exact-match set lookup keeps lines already extracted from the DOM out
+                seen = set(final_content)
+                for line in trafilatura_content.splitlines():
+                    line = line.strip()
+                    if len(line) > 5 and line not in seen:
+                        final_content.append(line)
+                        seen.add(line)
         
         # Join and clean up
         result = '\n\n'.join(filter(None, final_content))
         
         # Clean up excessive whitespace
-        result = re.sub(r'\n\s*\n\s*\n+', '\n\n', result)
-        result = re.sub(r'[ \t]+', ' ', result)
+        result = MULTI_NEWLINE_RE.sub('\n\n', result)
+        result = MULTI_SPACE_RE.sub(' ', result.replace('\t', ' '))
         
         if len(result.strip()) < 30:
             # Last resort - get absolutely everything
@@ -505,18 +742,37 @@ def extract_all_webpage_data(url: str, include_images: bool = False, include_vid
         
         return result.strip()
         
-    except requests.exceptions.Timeout:
-        raise Exception("Request timed out. The website may be slow to respond.")
-    except requests.exceptions.ConnectionError:
-        raise Exception("Unable to connect to the website. Please check the URL and your internet connection.")
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 404:
-            raise Exception("Page not found (404). Please check if the URL is correct.")
-        elif e.response.status_code == 403:
-            raise Exception("Access forbidden (403). The website may be blocking automated requests.")
-        elif e.response.status_code == 500:
-            raise Exception("Server error (500). The website is experiencing technical difficulties.")
-        else:
-            raise Exception(f"HTTP error {e.response.status_code}: {e.response.reason}")
     except Exception as e:
-        raise Exception(f"Error extracting content: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Error extracting content: {str(e)}")
+
+def extract_all_webpage_data(url: str, include_images: bool = False, include_videos: bool = False,
+                             session: Optional[requests.Session] = None, parse_in_process: bool = False) -> str:
+    """
+    Extract absolutely everything from a webpage including all text, metadata, and content.
+    Pass a shared session to reuse its pooled keep-alive connections across calls.
+    Set parse_in_process when calling from several threads at once, so parsing
+    runs in a worker process instead of every thread contending for the GIL.
+    """
+    html, declared_encoding, cached_results = _fetch_page(url, session)
+    
+    # An unchanged page already extracted with these options needs no parsing
+    options = (include_images, include_videos)
+    if cached_results is not None:
+        with _PAGE_CACHE_LOCK:
+            cached_result = cached_results.get(options)
+        if cached_result is not None:
+            return cached_result
+    
+    result = None
+    if parse_in_process:
+        pool = _parse_pool()
+        try:
+            result = pool.submit(extract_from_html, html, url, include_images, include_videos,
+                                 declared_encoding).result()
+        except BrokenProcessPool:
+            # A worker died; parse this page here and start over next time
+            _discard_parse_pool(pool)
+    if result is None:
+        result = extract_from_html(html, url, include_images, include_videos, declared_encoding)
+    _remember_result(url, html, options, result)
+    return result
\ No newline at end of file
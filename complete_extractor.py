@@ -3,6 +3,22 @@ from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import re
 import trafilatura
+from complete_data_extractor import (BROWSER_HEADERS, HEADING_PREFIXES, HTML_PARSER, MULTI_NEWLINE_RE, MULTI_SPACE_RE,
+                                     UA_RETRY_STATUSES, USER_AGENTS, check_fetchable, declared_charset, decode_body,
+                                     element_text, new_session, read_capped)
+
+# One pooled session for every call; headers are passed per request so it is
+# never mutated while shared between threads
+_SESSION = new_session(32)
+
+# Tags stripped outright, and the class/id matcher for ad and navigation blocks
+_REMOVED_TAGS = {'script', 'style', 'noscript', 'meta', 'link', 'iframe'}
+_BOILERPLATE_RE = re.compile(r'(ad|advertisement|sidebar|nav|menu|footer|header)', re.I)
+
+# Tag groups the content walk dispatches on
+_LIST_TAGS = {'ul', 'ol'}
+_CONTAINER_TAGS = {'div', 'section', 'article', 'main', 'aside', 'header', 'footer', 'nav'}
+_INLINE_TAGS = {'span', 'strong', 'em', 'b', 'i', 'a', 'code'}
 
 def extract_complete_webpage_content(url: str) -> str:
     """
@@ -14,63 +30,38 @@ def extract_complete_webpage_content(url: str) -> str:
         if not parsed_url.scheme or not parsed_url.netloc:
             raise ValueError("Invalid URL format")
         
-        # Enhanced headers to bypass basic bot detection
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0',
-            'DNT': '1',
-            'Sec-Ch-Ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-            'Sec-Ch-Ua-Mobile': '?0',
-            'Sec-Ch-Ua-Platform': '"Windows"'
-        }
-        
-        # Create session for better handling
-        session = requests.Session()
-        session.headers.update(headers)
-        
-        # Try multiple user agents if first fails
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0'
-        ]
-        
         response = None
-        last_error = None
         
-        for user_agent in user_agents:
-            try:
-                session.headers.update({'User-Agent': user_agent})
-                response = session.get(url, timeout=20, allow_redirects=True)
-                response.raise_for_status()
-                
-                # Check if we got meaningful content
-                if len(response.text) > 500:
-                    break
-                    
-            except Exception as e:
-                last_error = e
+        for user_agent in USER_AGENTS:
+            if response is not None:
+                response.close()
+            # Stream so a rejected attempt is closed before its body is downloaded;
+            # fail fast on an unreachable host, a read may take longer
+            response = _SESSION.get(url, headers={**BROWSER_HEADERS, 'User-Agent': user_agent},
+                                    timeout=(5, 20), allow_redirects=True, stream=True)
+            if response.status_code in UA_RETRY_STATUSES:
                 continue
+            response.raise_for_status()
+            check_fetchable(response)
+            html = read_capped(response)
+            
+            # Check if we got meaningful content
+            if len(html) > 500:
+                break
         
-        if not response or response.status_code != 200:
-            if last_error:
-                raise last_error
-            else:
-                raise Exception("Failed to fetch content with any user agent")
+        # Every user agent was turned away
+        if response.status_code in UA_RETRY_STATUSES:
+            response.raise_for_status()
+        if response.status_code != 200:
+            raise Exception("Failed to fetch content with any user agent")
+        
+        # A charset sent only in the Content-Type header is not in the bytes, so
+        # it is passed on to both parsers
+        declared_encoding = declared_charset(response)
         
         # Try trafilatura first as it's specifically designed for content extraction
         trafilatura_content = trafilatura.extract(
-            response.text,
+            decode_body(html, declared_encoding),
             include_comments=False,
             include_tables=True,
             include_formatting=True,
@@ -86,30 +77,40 @@ def extract_complete_webpage_content(url: str) -> str:
         if trafilatura_content and len(trafilatura_content.strip()) > 200:
             # Clean and format trafilatura output
             content = trafilatura_content.strip()
-            content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
+            content = MULTI_NEWLINE_RE.sub('\n\n', content)
             return content
         
         # Fall back to BeautifulSoup method
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Check if page seems to have meaningful content
-        body_text = soup.get_text(strip=True) if soup.body else soup.get_text(strip=True)
-        if len(body_text) < 100:
+        # Hand over the raw bytes so the page's own charset declaration is used
+        # when the header did not name one
+        soup = BeautifulSoup(html, HTML_PARSER, from_encoding=declared_encoding)
+        
+        # Check if page seems to have meaningful content; only the length matters,
+        # so count text until it reaches 100 characters instead of joining it all
+        text_length = 0
+        for string in soup.stripped_strings:
+            text_length += len(string)
+            if text_length >= 100:
+                break
+        if text_length < 100:
             # Try one more approach - get all visible text
             all_text = soup.get_text(separator=' ', strip=True)
             if len(all_text) > 50:
                 return all_text
             raise Exception("Page appears to have minimal content - may require JavaScript or be behind protection")
         
-        # Remove unwanted elements but preserve structure
-        for element in soup(['script', 'style', 'noscript', 'meta', 'link', 'iframe']):
-            element.decompose()
-        
-        # Remove common advertisement and navigation elements
-        for element in soup.find_all(['div', 'section'], class_=re.compile(r'(ad|advertisement|sidebar|nav|menu|footer|header)', re.I)):
-            element.decompose()
-        
-        for element in soup.find_all(['div', 'section'], id=re.compile(r'(ad|advertisement|sidebar|nav|menu|footer|header)', re.I)):
+        # Remove unwanted elements but preserve structure, along with common
+        # advertisement and navigation blocks, collected in a single tree walk
+        elements_to_remove = []
+        for element in soup.find_all(True):
+            if element.name in _REMOVED_TAGS:
+                elements_to_remove.append(element)
+            elif element.name in ('div', 'section') and (
+                    any(_BOILERPLATE_RE.search(cls) for cls in element.get('class', [])) or
+                    _BOILERPLATE_RE.search(element.get('id', ''))):
+                elements_to_remove.append(element)
+        
+        for element in elements_to_remove:
             element.decompose()
         
         # Extract content with structure preservation
@@ -117,8 +118,9 @@ def extract_complete_webpage_content(url: str) -> str:
         
         # Get title
         title = soup.find('title')
-        if title and title.get_text(strip=True):
-            content_parts.append(f"# {title.get_text(strip=True)}\n")
+        title_text = element_text(title) if title else ''
+        if title_text:
+            content_parts.append(f"# {title_text}\n")
         
         # Process all content elements
         body = soup.find('body') or soup
@@ -131,24 +133,22 @@ def extract_complete_webpage_content(url: str) -> str:
                 return results
             
             # Handle headings with clear formatting
-            if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                text = element.get_text(strip=True)
+            if element.name in HEADING_PREFIXES:
+                text = element_text(element)
                 if text and len(text) > 2:
-                    heading_level = int(element.name[1])
-                    prefix = '#' * heading_level
-                    results.append(f"\n{prefix} {text}\n")
+                    results.append(f"\n{HEADING_PREFIXES[element.name]} {text}\n")
             
             # Handle paragraphs as distinct blocks
             elif element.name == 'p':
-                text = element.get_text(strip=True)
+                text = element_text(element)
                 if text and len(text) > 10:
                     results.append(f"{text}\n\n")
             
             # Handle list containers
-            elif element.name in ['ul', 'ol']:
+            elif element.name in _LIST_TAGS:
                 list_items = []
                 for li in element.find_all('li', recursive=False):
-                    li_text = li.get_text(strip=True)
+                    li_text = element_text(li)
                     if li_text and len(li_text) > 3:
                         list_items.append(f"• {li_text}")
                 
@@ -162,7 +162,7 @@ def extract_complete_webpage_content(url: str) -> str:
                 for row in element.find_all('tr'):
                     cells = []
                     for cell in row.find_all(['td', 'th']):
-                        cell_text = cell.get_text(strip=True)
+                        cell_text = element_text(cell)
                         if cell_text:
                             cells.append(cell_text)
                     if cells:
@@ -173,7 +173,7 @@ def extract_complete_webpage_content(url: str) -> str:
                     results.append("\n")
             
             # Handle block elements that should be separated
-            elif element.name in ['div', 'section', 'article', 'main', 'aside', 'header', 'footer', 'nav']:
+            elif element.name in _CONTAINER_TAGS:
                 # Check if this element has meaningful direct text
                 direct_text = []
                 for child in element.children:
@@ -195,15 +195,21 @@ def extract_complete_webpage_content(url: str) -> str:
                             results.extend(child_results)
             
             # Handle other text elements
-            elif element.name in ['span', 'strong', 'em', 'b', 'i', 'a', 'code']:
-                text = element.get_text(strip=True)
+            elif element.name in _INLINE_TAGS:
+                text = element_text(element)
                 if text and len(text) > 5:
                     # Check if this is likely standalone content
                     parent_has_text = False
                     if element.parent:
-                        parent_text = element.parent.get_text(strip=True)
-                        if len(parent_text) > len(text) * 2:
-                            parent_has_text = True
+                        # Measure the parent's text only until it is known to be
+                        # more than twice as long, without building the string
+                        limit = len(text) * 2
+                        parent_length = 0
+                        for string in element.parent.stripped_strings:
+                            parent_length += len(string)
+                            if parent_length > limit:
+                                parent_has_text = True
+                                break
                     
                     if not parent_has_text:
                         results.append(f"{text}\n")
@@ -217,8 +223,8 @@ def extract_complete_webpage_content(url: str) -> str:
         final_content = '\n'.join(all_content)
         
         # Clean up excessive whitespace while preserving structure
-        final_content = re.sub(r'\n\s*\n\s*\n+', '\n\n', final_content)
-        final_content = re.sub(r'[ \t]+', ' ', final_content)
+        final_content = MULTI_NEWLINE_RE.sub('\n\n', final_content)
+        final_content = MULTI_SPACE_RE.sub(' ', final_content.replace('\t', ' '))
         
         # Final validation - be more lenient
         if len(final_content.strip()) < 50:
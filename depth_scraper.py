@@ -1,11 +1,17 @@
-import requests
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import time
 from typing import Set, List, Dict, Any
-from complete_data_extractor import extract_all_webpage_data
+from complete_data_extractor import (HTML_PARSER, IMAGE_MARKDOWN_RE, check_fetchable, extract_all_webpage_data,
+                                     new_session, read_capped)
 import re
 
+# Video markers counted in each page's extracted content, alongside images
+_VIDEO_MARKER_RE = re.compile(r'\*\*\[.*?VIDEO.*?\]\*\*', re.IGNORECASE)
+
+# Link harvesting only needs the anchors, so the rest of the page is never built
+_LINKS_ONLY = SoupStrainer('a', href=True)
+
 class DepthScraper:
     def __init__(self, max_depth: int = 2, delay: float = 1.0, max_pages: int = 10):
         """
@@ -21,15 +27,22 @@ class DepthScraper:
         self.max_pages = max_pages
         self.visited_urls: Set[str] = set()
         self.scraped_content: List[Dict[str, Any]] = []
+        # Every page of a crawl is on the same host, so keep its connections open
+        self.session = new_session()
         
     def get_links_from_page(self, url: str, base_domain: str) -> List[str]:
         """Extract links from a webpage that belong to the same domain"""
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            # Stream the body so an oversized page is dropped before it is all read
+            with self.session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                check_fetchable(response)
+                html = read_capped(response)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(html, HTML_PARSER, parse_only=_LINKS_ONLY)
             links = []
+            # A page often links the same URL several times; keep the first only
+            seen_links = set()
             
             for link in soup.find_all('a', href=True):
                 try:
@@ -51,10 +64,13 @@ class DepthScraper:
                     if parsed_url.query:
                         clean_url += f"?{parsed_url.query}"
                     
-                    if clean_url not in self.visited_urls and clean_url != url:
+                    if clean_url not in seen_links and clean_url not in self.visited_urls and clean_url != url:
+                        seen_links.add(clean_url)
                         links.append(clean_url)
+                        if len(links) == 20:  # Limit to first 20 links per page
+                            break
             
-            return links[:20]  # Limit to first 20 links per page
+            return links
             
         except Exception as e:
             print(f"Error extracting links from {url}: {e}")
@@ -106,7 +122,8 @@ class DepthScraper:
                 content = extract_all_webpage_data(
                     current_url, 
                     include_images=include_images, 
-                    include_videos=include_videos
+                    include_videos=include_videos,
+                    session=self.session
                 )
                 
                 if content and len(content.strip()) > 100:
@@ -120,8 +137,8 @@ class DepthScraper:
                     }
                     
                     # Count images and videos
-                    image_count = len(re.findall(r'!\[.*?\]\([^)]+\)', content))
-                    video_count = len(re.findall(r'\*\*\[.*?VIDEO.*?\]\*\*', content, re.IGNORECASE))
+                    image_count = len(IMAGE_MARKDOWN_RE.findall(content))
+                    video_count = len(_VIDEO_MARKER_RE.findall(content))
                     
                     page_data['image_count'] = image_count
                     page_data['video_count'] = video_count
@@ -4,6 +4,8 @@ from collections import Counter, defaultdict
 from typing import List, Dict, Any
 import math
 
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+
 # Download required NLTK data
 try:
     nltk.data.find('tokenizers/punkt')
@@ -154,7 +156,7 @@ def split_into_paragraphs(text: str) -> List[str]:
         return []
     
     # Split by double newlines first
-    paragraphs = re.split(r'\n\s*\n', text)
+    paragraphs = _PARAGRAPH_BREAK_RE.split(text)
     
     # If no clear paragraph breaks, split by sentences and group
     if len(paragraphs) <= 1:
@@ -268,14 +270,17 @@ def merge_small_groups(groups: List[Dict[str, Any]], min_size: int = 200) -> Lis
         else:
             merged_groups.append(group)
     
+    # Content merged into each group, keyed by id() and joined once at the end
+    merged_content = {}
+    
     # Try to merge small groups with large ones based on keyword similarity
     for small_group in small_groups:
         best_match = None
         best_similarity = 0
+        small_keywords = set(small_group['keywords'][:5])
         
         for large_group in merged_groups:
             # Calculate keyword similarity
-            small_keywords = set(small_group['keywords'][:5])
             large_keywords = set(large_group['keywords'][:5])
             
             if small_keywords and large_keywords:
@@ -286,7 +291,7 @@ def merge_small_groups(groups: List[Dict[str, Any]], min_size: int = 200) -> Lis
         
         if best_match:
             # Merge with the best matching group
-            best_match['content'] += '\n\n' + small_group['content']
+            merged_content.setdefault(id(best_match), [best_match['content']]).append(small_group['content'])
             # Update keywords
             combined_keywords = list(set(best_match['keywords'] + small_group['keywords']))
             best_match['keywords'] = combined_keywords[:10]
@@ -294,4 +299,9 @@ def merge_small_groups(groups: List[Dict[str, Any]], min_size: int = 200) -> Lis
             # Keep as separate group if no good match found
             merged_groups.append(small_group)
     
+    for group in merged_groups:
+        parts = merged_content.get(id(group))
+        if parts:
+            group['content'] = '\n\n'.join(parts)
+    
     return merged_groups
@@ -2,7 +2,11 @@ import trafilatura
 import requests
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
-import re
+from complete_data_extractor import HTML_PARSER, MULTI_NEWLINE_RE, declared_charset, decode_body, new_session
+
+# Pooled session for the fallback fetches, so repeat hosts reuse their
+# keep-alive connections
+_SESSION = new_session(20)
 
 def get_website_text_content(url: str) -> str:
     """
@@ -27,9 +31,10 @@ def get_website_text_content(url: str) -> str:
         
         if not downloaded:
             # Fallback to manual request if trafilatura fails
-            response = requests.get(url, headers=headers, timeout=10)
+            response = _SESSION.get(url, headers=headers, timeout=10)
             response.raise_for_status()
-            downloaded = response.text
+            # Decoded here when the charset is sent only in the Content-Type header
+            downloaded = decode_body(response.content, declared_charset(response))
         
         # Extract text content using trafilatura
         text = trafilatura.extract(
@@ -84,9 +89,10 @@ def get_structured_content(url: str) -> str:
         
         if not downloaded:
             # Fallback to manual request if trafilatura fails
-            response = requests.get(url, headers=headers, timeout=10)
+            response = _SESSION.get(url, headers=headers, timeout=10)
             response.raise_for_status()
-            downloaded = response.text
+            # Decoded here when the charset is sent only in the Content-Type header
+            downloaded = decode_body(response.content, declared_charset(response))
         
         # First try trafilatura with maximum extraction settings
         text = trafilatura.extract(
@@ -103,22 +109,21 @@ def get_structured_content(url: str) -> str:
         )
         
         # Always use BeautifulSoup to extract comprehensive content
-        soup = BeautifulSoup(downloaded, 'html.parser')
+        soup = BeautifulSoup(downloaded, HTML_PARSER)
         
         # Remove unwanted elements but keep more content
         for element in soup(["script", "style", "noscript"]):
             element.decompose()
         
         # Extract all text content from the entire page
-        all_text_elements = soup.find_all(text=True)
+        all_text_elements = soup.find_all(string=True)
         full_text_parts = []
         
         for text_element in all_text_elements:
+            # Already stripped, so anything left is not just whitespace
             text_content = text_element.strip()
-            if text_content and len(text_content) > 3:  # Keep even shorter text
-                # Skip if it's just whitespace or common web elements
-                if not re.match(r'^[\s\n\r\t]*$', text_content):
-                    full_text_parts.append(text_content)
+            if len(text_content) > 3:  # Keep even shorter text
+                full_text_parts.append(text_content)
         
         # Combine all extracted text
         comprehensive_text = '\n'.join(full_text_parts)
@@ -158,6 +163,6 @@ def clean_text(text: str) -> str:
         return ""
     
     # Only remove excessive blank lines while preserving paragraph breaks
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    text = MULTI_NEWLINE_RE.sub('\n\n', text)
     
     return text.strip()